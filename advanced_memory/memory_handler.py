@@ -11,20 +11,132 @@ Our vision for next-generation agentic memory with:
 
 import os
 import json
+import atexit
+import errno
 import asyncio
 import shutil
 import hashlib
+import logging
+import functools
+import threading
+import time
+import weakref
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
-from collections import OrderedDict, defaultdict
-from datetime import datetime
-from dataclasses import dataclass
+from collections import Counter, OrderedDict, defaultdict, deque
 from enum import Enum
 import sys
 sys.path.append('..')
 from memory_interface import MemoryInterface
 from latency_benchmark import LatencyTracker, OperationType
 
+try:
+    import xxhash
+except ImportError:  # optional, blake2b is the fallback
+    xxhash = None
+
+logger = logging.getLogger(__name__)
+
+# Instances not yet closed. Weak, so the exit hook never keeps one alive
+_open_instances = weakref.WeakSet()
+
+
+def _close_open_instances():
+    """atexit hook: close every AdvancedMemory that is still open"""
+    for memory in list(_open_instances):
+        memory._close_at_exit()
+
+
+atexit.register(_close_open_instances)
+
+
+def _fingerprint(content: str) -> int:
+    """Cheap 64-bit content fingerprint for change detection"""
+    data = content.encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def _synchronized(method):
+    """Run an AdvancedMemory method under the instance lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _flush_loop(ref, closed: threading.Event, interval: float):
+    """Background flush thread; holds the instance only while flushing"""
+    while not closed.wait(interval):
+        memory = ref()
+        if memory is None:
+            return
+        memory._background_flush()
+        del memory
+
+
+def _reorg_loop(ref, wake: threading.Event, closed: threading.Event):
+    """Background reorganization thread; holds the instance only while working"""
+    while True:
+        wake.wait()
+        wake.clear()
+        memory = None if closed.is_set() else ref()
+        if memory is None:
+            return
+        memory._background_reorganize()
+        del memory
+
+
+def _nth_newline_index(s: str, n: int) -> int:
+    """Index of the n-th newline in s (1-based), or -1 if there are fewer"""
+    pos = -1
+    for _ in range(n):
+        pos = s.find("\n", pos + 1)
+        if pos < 0:
+            return -1
+    return pos
+
+
+def _insert_line(content: str, insert_line: int, insert_text: str) -> str:
+    """Insert text as line `insert_line`, padding with empty lines if needed"""
+    if insert_line == 0:
+        return f"{insert_text}\n{content}" if content else insert_text
+    
+    pos = _nth_newline_index(content, insert_line)
+    if pos >= 0:
+        return content[:pos] + "\n" + insert_text + content[pos:]
+    
+    # Past the last line: append, padding the gap with empty lines
+    line_count = content.count("\n") + 1 if content else 0
+    padding = "\n" * (insert_line - line_count + (1 if content else 0))
+    return content + padding + insert_text
+
+
+def _slice_lines(content: str, start: int, end: int) -> str:
+    """Lines start..end (1-based, inclusive) without splitting the whole text"""
+    first = max(0, start - 1)
+    if end < 0:
+        # Negative ends keep plain list-slice semantics
+        return "\n".join(content.splitlines()[first:end])
+    
+    begin = 0
+    for _ in range(first):
+        nl = content.find("\n", begin)
+        if nl < 0:
+            return ""
+        begin = nl + 1
+    
+    stop = pos = begin
+    for taken in range(end - first):
+        nl = content.find("\n", pos)
+        if nl < 0:
+            # Hit EOF; a trailing newline doesn't start another line
+            return content[begin:stop] if taken and pos == len(content) else content[begin:]
+        stop, pos = nl, nl + 1
+    return content[begin:stop]
+
 
 class MemoryTier(Enum):
     """Memory tier levels"""
@@ -33,21 +145,73 @@ class MemoryTier(Enum):
     OVERFLOW = "overflow"    # Cold storage, unlimited, RAG-indexed
 
 
-@dataclass
 class MemoryBlock:
     """A block of memory with metadata"""
-    content: str
-    tier: MemoryTier
-    access_count: int = 0
-    last_access: float = 0
-    importance_score: float = 0.5
-    created_at: float = 0
-    size_bytes: int = 0
-    
-    def update_access(self):
+    
+    # Spelled out rather than @dataclass(slots=True), which needs Python 3.10
+    __slots__ = (
+        "content", "tier", "access_count", "last_access",
+        "importance_score", "created_at", "size_bytes", "disk_fingerprint",
+    )
+    
+    def __init__(self, content: Optional[str], tier: MemoryTier,
+                 access_count: int = 0, last_access: float = 0,
+                 importance_score: float = 0.5, created_at: float = 0,
+                 size_bytes: int = 0, disk_fingerprint: Optional[int] = None):
+        self.content = content  # None until first access for lazily loaded blocks
+        self.tier = tier
+        self.access_count = access_count
+        self.last_access = last_access
+        self.importance_score = importance_score
+        self.created_at = created_at
+        self.size_bytes = size_bytes
+        self.disk_fingerprint = disk_fingerprint  # Fingerprint of the tier file, if known
+    
+    def __repr__(self):
+        return f"MemoryBlock(tier={self.tier}, size_bytes={self.size_bytes}, access_count={self.access_count})"
+    
+    def update_access(self, now: Optional[float] = None):
         """Update access statistics"""
         self.access_count += 1
-        self.last_access = datetime.now().timestamp()
+        self.last_access = time.time() if now is None else now
+
+
+class CountMinSketch:
+    """
+    Fixed-size frequency estimator for promotion decisions.
+    
+    Estimates never undercount; collisions can only inflate them.
+    Counters are halved every `decay_every` additions so old bursts fade.
+    """
+    
+    def __init__(self, width: int = 2048, depth: int = 4, decay_every: int = 8192):
+        self.width = width
+        self.depth = depth
+        self.decay_every = decay_every
+        self.rows = [[0] * width for _ in range(depth)]
+        self.additions = 0
+    
+    def _columns(self, key: str):
+        return [hash((seed, key)) % self.width for seed in range(self.depth)]
+    
+    def add(self, key: str, count: int = 1):
+        """Record `count` occurrences of key"""
+        for row, col in zip(self.rows, self._columns(key)):
+            row[col] += count
+        
+        self.additions += count
+        if self.additions >= self.decay_every:
+            self.decay()
+    
+    def estimate(self, key: str) -> int:
+        """Upper-bound estimate of how often key was added"""
+        return min(row[col] for row, col in zip(self.rows, self._columns(key)))
+    
+    def decay(self):
+        """Halve every counter"""
+        for row in self.rows:
+            row[:] = [c >> 1 for c in row]
+        self.additions = 0
 
 
 class AdvancedMemory(MemoryInterface):
@@ -73,7 +237,32 @@ class AdvancedMemory(MemoryInterface):
         MemoryTier.OVERFLOW: 200
     }
     
-    def __init__(self, base_path: str = "./memories"):
+    # Tier transition thresholds. Promotion needs a recent access (< 5 min)
+    # while demotion waits for 15 min of idleness, so blocks aged in between
+    # stay where they are instead of bouncing on every reorganization.
+    PROMOTE_MIN_ACCESS = 5        # sketch-estimated views
+    PROMOTE_MAX_AGE_S = 300       # archival -> working
+    DEMOTE_MAX_AGE_S = 900        # working -> archival
+    ARCHIVE_MAX_AGE_S = 3600      # archival -> overflow
+    
+    # Once the working tier overflows, LRU demotion drains it to this size
+    WORKING_LOW_WATERMARK = 3072
+    
+    # Tier indicators for directory listings
+    _TIER_ICONS = {
+        MemoryTier.WORKING: "🔥",   # Hot
+        MemoryTier.ARCHIVAL: "📚",  # Warm
+        MemoryTier.OVERFLOW: "🧊"   # Cold
+    }
+    
+    # operation_counts keys for per-tier view hits
+    _VIEW_KEYS = {tier: f"view_{tier.value}" for tier in MemoryTier}
+    
+    # Timestamps kept per path for access-pattern learning
+    ACCESS_HISTORY_LIMIT = 32
+    
+    def __init__(self, base_path: str = "./memories", flush_interval: float = 0.5,
+                 fsync: bool = False):
         """Initialize advanced memory system"""
         self.base_path = Path(base_path).resolve()
         self.base_path.mkdir(parents=True, exist_ok=True)
@@ -88,24 +277,89 @@ class AdvancedMemory(MemoryInterface):
         # Latency tracking
         self.tracker = LatencyTracker(str(self.base_path))
         
-        # Memory blocks by tier
+        # Memory blocks by tier; the working tier is kept in LRU order
         self.memory_blocks: Dict[MemoryTier, Dict[str, MemoryBlock]] = {
             tier: {} for tier in MemoryTier
         }
+        self.memory_blocks[MemoryTier.WORKING] = OrderedDict()
+        
+        # Flat name -> block index; memory_blocks stays the per-tier view
+        self.index: Dict[str, MemoryBlock] = {}
+        
+        # Running size totals per tier, kept in sync on every mutation
+        self.tier_size_bytes: Dict[MemoryTier, int] = {
+            tier: 0 for tier in MemoryTier
+        }
         
         # Access pattern learning
-        self.access_patterns = defaultdict(list)  # path -> [timestamps]
+        self.access_patterns = defaultdict(
+            lambda: deque(maxlen=self.ACCESS_HISTORY_LIMIT)
+        )  # path -> recent timestamps, oldest first
         self.predicted_next = set()  # Paths likely to be accessed next
         
+        # Bounded-memory view frequencies, used for promotion
+        self.freq_sketch = CountMinSketch()
+        
+        # Co-access graph: path -> Counter of paths viewed close to it
+        self.recent_accesses = deque(maxlen=8)
+        self.cooccurrence: Dict[str, Counter] = defaultdict(Counter)
+        
         # Operation counts
         self.operation_counts = defaultdict(int)
         
+        # Command dispatch table, bound once
+        self._handlers = {
+            "view": self._handle_view,
+            "create": self._handle_create,
+            "str_replace": self._handle_str_replace,
+            "insert": self._handle_insert,
+            "delete": self._handle_delete,
+            "rename": self._handle_rename
+        }
+        
         # Load existing memories into tiers
         self._load_memories()
         
-        # Start background reorganization (would be async in production)
+        # Background reorganization, woken every N operations
         self.reorganize_counter = 0
         self.reorganize_threshold = 10  # Reorganize every N operations
+        self._reorg_wake = threading.Event()
+        
+        # Write-behind: blocks are the source of truth, files catch up on flush
+        self._lock = threading.RLock()
+        self.dirty: Set[str] = set()
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._closed = threading.Event()
+        
+        # Workers only hold a weak reference, so an instance that is dropped
+        # without close() can still be collected (see __del__)
+        ref = weakref.ref(self)
+        self._flush_thread = threading.Thread(
+            target=_flush_loop, args=(ref, self._closed, flush_interval), daemon=True
+        )
+        self._flush_thread.start()
+        self._reorg_thread = threading.Thread(
+            target=_reorg_loop, args=(ref, self._reorg_wake, self._closed), daemon=True
+        )
+        self._reorg_thread.start()
+        _open_instances.add(self)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        """Close on leaving a with block"""
+        self.close()
+    
+    def __del__(self):
+        # Dropped without close(): persist pending writes; the workers see
+        # the closed flag (or the dead weak reference) and exit on their own
+        closed = getattr(self, "_closed", None)
+        if closed is not None and not closed.is_set():
+            closed.set()
+            self._reorg_wake.set()
+            self._flush_pending()
     
     def get_tool_definition(self) -> Dict[str, Any]:
         """Tool definition - compatible with Claude"""
@@ -117,32 +371,63 @@ class AdvancedMemory(MemoryInterface):
     def _load_memories(self):
         """Load existing memories into appropriate tiers"""
         for tier in MemoryTier:
-            tier_path = self.tier_paths[tier]
-            for file_path in tier_path.glob("*"):
-                if file_path.is_file():
-                    rel_path = file_path.name
-                    content = file_path.read_text(encoding="utf-8")
+            with os.scandir(self.tier_paths[tier]) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    
+                    # Cold overflow data stays on disk until first touched
+                    if tier == MemoryTier.OVERFLOW:
+                        content = None
+                        size = st.st_size
+                        fingerprint = None
+                    else:
+                        with open(entry.path, encoding="utf-8") as f:
+                            content = f.read()
+                        size = len(content)
+                        fingerprint = _fingerprint(content)
                     
                     block = MemoryBlock(
                         content=content,
                         tier=tier,
-                        created_at=file_path.stat().st_ctime,
-                        last_access=file_path.stat().st_atime,
-                        size_bytes=len(content)
+                        created_at=st.st_ctime,
+                        last_access=st.st_atime,
+                        size_bytes=size,
+                        disk_fingerprint=fingerprint
                     )
                     
-                    self.memory_blocks[tier][rel_path] = block
+                    self.memory_blocks[tier][entry.name] = block
+                    self.index[entry.name] = block
+                    self.tier_size_bytes[tier] += block.size_bytes
+        
+        # Seed the working tier's LRU order from last access times
+        working = self.memory_blocks[MemoryTier.WORKING]
+        for name in sorted(working, key=lambda n: working[n].last_access):
+            working.move_to_end(name)
+    
+    def _ensure_loaded(self, name: str, block: MemoryBlock) -> str:
+        """Read a lazily loaded block's content from disk"""
+        if block.content is None:
+            tier_path = self.tier_paths[block.tier] / name
+            block.content = tier_path.read_text(encoding="utf-8")
+            block.disk_fingerprint = _fingerprint(block.content)
+            
+            # On-disk size was a byte count; switch to the usual length
+            size = len(block.content)
+            self.tier_size_bytes[block.tier] += size - block.size_bytes
+            block.size_bytes = size
+        return block.content
     
-    def _determine_tier(self, path: str, content: str) -> MemoryTier:
+    def _determine_tier(self, path: str, content: str, now: Optional[float] = None) -> MemoryTier:
         """Determine which tier a memory belongs to"""
         size = len(content)
         
         # Check access patterns
         if path in self.access_patterns:
-            recent_accesses = len([
-                t for t in self.access_patterns[path]
-                if datetime.now().timestamp() - t < 300  # Last 5 minutes
-            ])
+            recent_accesses = self._count_recent_accesses(
+                path, window=300, limit=4, now=now
+            )
             
             if recent_accesses > 3:
                 return MemoryTier.WORKING
@@ -150,7 +435,7 @@ class AdvancedMemory(MemoryInterface):
         # Size-based allocation
         if size <= self.TIER_LIMITS[MemoryTier.WORKING]:
             # Check if working tier has space
-            working_size = sum(b.size_bytes for b in self.memory_blocks[MemoryTier.WORKING].values())
+            working_size = self.tier_size_bytes[MemoryTier.WORKING]
             if working_size + size <= self.TIER_LIMITS[MemoryTier.WORKING]:
                 return MemoryTier.WORKING
         
@@ -159,54 +444,174 @@ class AdvancedMemory(MemoryInterface):
         
         return MemoryTier.OVERFLOW
     
+    def _touch(self, name: str, block: MemoryBlock):
+        """Mark a working-tier block as most recently used"""
+        if block.tier == MemoryTier.WORKING:
+            self.memory_blocks[MemoryTier.WORKING].move_to_end(name)
+    
+    def _size_class(self, size: int) -> int:
+        """Index of the smallest tier whose per-item limit fits `size`"""
+        if size <= self.TIER_LIMITS[MemoryTier.WORKING]:
+            return 0
+        if size <= self.TIER_LIMITS[MemoryTier.ARCHIVAL]:
+            return 1
+        return 2
+    
+    def _retier_if_resized(self, name: str, block: MemoryBlock, old_size: int,
+                           now: Optional[float] = None):
+        """Re-place an edited block, but only if it crossed a size boundary"""
+        if self._size_class(old_size) == self._size_class(block.size_bytes):
+            return
+        
+        new_tier = self._determine_tier(name, block.content, now)
+        if new_tier != block.tier:
+            self._move_between_tiers(name, block.tier, new_tier)
+    
+    def _count_recent_accesses(self, path: str, window: float, limit: int,
+                               now: Optional[float] = None) -> int:
+        """Count accesses within the last `window` seconds, stopping at `limit`"""
+        cutoff = (time.time() if now is None else now) - window
+        count = 0
+        # Timestamps are appended in order, so walk back from the newest
+        for t in reversed(self.access_patterns[path]):
+            if t <= cutoff or count >= limit:
+                break
+            count += 1
+        return count
+    
+    def _record_coaccess(self, current_path: str):
+        """Link this access to the last few distinct paths viewed"""
+        for other in self.recent_accesses:
+            if other != current_path:
+                self.cooccurrence[current_path][other] += 1
+                self.cooccurrence[other][current_path] += 1
+        self.recent_accesses.append(current_path)
+    
     def _predict_next_access(self, current_path: str):
         """Predict what might be accessed next based on patterns"""
-        self.predicted_next.clear()
-        
-        # Simple prediction: files often accessed together
-        if current_path in self.access_patterns:
-            # Find files accessed within 10 seconds of this one
-            current_times = self.access_patterns[current_path]
-            if current_times:
-                last_time = current_times[-1]
-                
-                for other_path, times in self.access_patterns.items():
-                    if other_path != current_path:
-                        for t in times:
-                            if abs(t - last_time) < 10:  # Within 10 seconds
-                                self.predicted_next.add(other_path)
-                                break
+        # Files most often viewed alongside this one
+        neighbours = self.cooccurrence.get(current_path)
+        if not neighbours:
+            self.predicted_next = set()
+            return
+        
+        self.predicted_next = {p for p, _ in neighbours.most_common(5)}
+    
+    def _prefetch_predicted(self):
+        """Ask the OS to start reading predicted blocks that aren't loaded yet"""
+        if not hasattr(os, "posix_fadvise"):
+            return
+        
+        for name in self.predicted_next:
+            block = self.index.get(name)
+            if block is None or block.content is not None:
+                continue
+            try:
+                fd = os.open(self.tier_paths[block.tier] / name, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+    
+    def _forget_coaccess(self, path: str):
+        """Drop a path from the co-access graph"""
+        for other in self.cooccurrence.pop(path, {}):
+            neighbours = self.cooccurrence.get(other)
+            if neighbours is not None:
+                neighbours.pop(path, None)
+        if path in self.recent_accesses:
+            self.recent_accesses = deque(
+                (p for p in self.recent_accesses if p != path),
+                maxlen=self.recent_accesses.maxlen
+            )
+    
+    def _rename_coaccess(self, old_path: str, new_path: str):
+        """Carry a path's co-access history over to its new name"""
+        neighbours = self.cooccurrence.pop(old_path, None)
+        if neighbours:
+            self.cooccurrence[new_path] = neighbours
+            for other in neighbours:
+                other_counts = self.cooccurrence[other]
+                other_counts[new_path] = other_counts.pop(old_path, 0)
+        if old_path in self.recent_accesses:
+            self.recent_accesses = deque(
+                (new_path if p == old_path else p for p in self.recent_accesses),
+                maxlen=self.recent_accesses.maxlen
+            )
+        if old_path in self.predicted_next:
+            self.predicted_next.discard(old_path)
+            self.predicted_next.add(new_path)
     
     def _reorganize_if_needed(self):
         """Trigger reorganization periodically"""
         self.reorganize_counter += 1
         
         if self.reorganize_counter >= self.reorganize_threshold:
-            self._reorganize_memories()
+            # Hand off to the worker; the request path never waits on a scan
+            self._reorg_wake.set()
             self.reorganize_counter = 0
     
+    def _background_reorganize(self):
+        """One reorganization pass for the worker thread"""
+        try:
+            with self._lock:
+                self._reorganize_memories()
+        except Exception:
+            # A failed pass (e.g. a tier move hitting an OSError) must not end reorganization
+            logger.exception("Background reorganization failed")
+    
     def _reorganize_memories(self):
         """Reorganize memories between tiers based on usage"""
-        now = datetime.now().timestamp()
+        now = time.time()
         
         # Promote frequently accessed from archival to working
-        for path, block in list(self.memory_blocks[MemoryTier.ARCHIVAL].items()):
-            if block.access_count > 5 and (now - block.last_access) < 300:
+        archival = self.memory_blocks[MemoryTier.ARCHIVAL]
+        for path in self._select_by_idle_time(MemoryTier.ARCHIVAL, now,
+                                              max_idle=self.PROMOTE_MAX_AGE_S):
+            block = archival[path]
+            if self.freq_sketch.estimate(path) >= self.PROMOTE_MIN_ACCESS:
                 # Check if working tier has space
-                working_size = sum(b.size_bytes for b in self.memory_blocks[MemoryTier.WORKING].values())
+                working_size = self.tier_size_bytes[MemoryTier.WORKING]
                 if working_size + block.size_bytes <= self.TIER_LIMITS[MemoryTier.WORKING]:
                     # Promote to working
                     self._move_between_tiers(path, MemoryTier.ARCHIVAL, MemoryTier.WORKING)
         
-        # Demote old items from working to archival
-        for path, block in list(self.memory_blocks[MemoryTier.WORKING].items()):
-            if (now - block.last_access) > 600:  # Not accessed in 10 minutes
-                self._move_between_tiers(path, MemoryTier.WORKING, MemoryTier.ARCHIVAL)
+        # Demote from the cold end of the working LRU: idle items, plus
+        # enough extra to get back under the low watermark if it overflowed
+        working = self.memory_blocks[MemoryTier.WORKING]
+        shrinking = self.tier_size_bytes[MemoryTier.WORKING] > self.TIER_LIMITS[MemoryTier.WORKING]
+        while working:
+            path, block = next(iter(working.items()))
+            if shrinking and self.tier_size_bytes[MemoryTier.WORKING] <= self.WORKING_LOW_WATERMARK:
+                shrinking = False
+            if not shrinking and (now - block.last_access) <= self.DEMOTE_MAX_AGE_S:
+                break
+            self._move_between_tiers(path, MemoryTier.WORKING, MemoryTier.ARCHIVAL)
         
         # Move very old items to overflow
-        for path, block in list(self.memory_blocks[MemoryTier.ARCHIVAL].items()):
-            if (now - block.last_access) > 3600:  # Not accessed in 1 hour
-                self._move_between_tiers(path, MemoryTier.ARCHIVAL, MemoryTier.OVERFLOW)
+        for path in self._select_by_idle_time(MemoryTier.ARCHIVAL, now,
+                                              min_idle=self.ARCHIVE_MAX_AGE_S):
+            self._move_between_tiers(path, MemoryTier.ARCHIVAL, MemoryTier.OVERFLOW)
+    
+    def _select_by_idle_time(self, tier: MemoryTier, now: float,
+                             min_idle: Optional[float] = None,
+                             max_idle: Optional[float] = None) -> List[str]:
+        """Names in a tier idle for more than min_idle / less than max_idle seconds"""
+        blocks = self.memory_blocks[tier]
+        
+        selected = []
+        for name, block in blocks.items():
+            idle = now - block.last_access
+            if min_idle is not None and idle <= min_idle:
+                continue
+            if max_idle is not None and idle >= max_idle:
+                continue
+            selected.append(name)
+        return selected
     
     def _move_between_tiers(self, path: str, from_tier: MemoryTier, to_tier: MemoryTier):
         """Move a memory block between tiers"""
@@ -216,14 +621,92 @@ class AdvancedMemory(MemoryInterface):
         block = self.memory_blocks[from_tier].pop(path)
         block.tier = to_tier
         self.memory_blocks[to_tier][path] = block
+        self.tier_size_bytes[from_tier] -= block.size_bytes
+        self.tier_size_bytes[to_tier] += block.size_bytes
         
-        # Move physical file
+        # Move physical file - tiers share a filesystem, so this is a rename
         from_path = self.tier_paths[from_tier] / path
         to_path = self.tier_paths[to_tier] / path
         
-        if from_path.exists():
-            to_path.write_text(block.content, encoding="utf-8")
-            from_path.unlink()
+        try:
+            os.replace(from_path, to_path)
+        except FileNotFoundError:
+            # Never flushed (or removed underneath us): let the flush write it
+            block.disk_fingerprint = None
+            self.dirty.add(path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # Tier directories on different devices: copy then remove
+            shutil.move(from_path, to_path)
+    
+    def _background_flush(self):
+        """One periodic flush for the worker thread"""
+        try:
+            self.flush()
+        except OSError as e:
+            # Failed names stay dirty; keep the thread alive to retry them
+            logger.warning("Background flush failed, will retry: %s", e)
+        except Exception:
+            logger.exception("Background flush failed")
+    
+    @_synchronized
+    def flush(self):
+        """Write every dirty block to its tier file; blocks that fail stay dirty"""
+        dirty, self.dirty = self.dirty, set()
+        error = None
+        for name in dirty:
+            block = self.index.get(name)
+            if block is None or block.content is None:
+                continue
+            
+            # Edits that net out to the on-disk content need no write
+            fingerprint = _fingerprint(block.content)
+            if fingerprint == block.disk_fingerprint:
+                continue
+            
+            tier_path = self.tier_paths[block.tier] / name
+            try:
+                with open(tier_path, "w", encoding="utf-8") as f:
+                    f.write(block.content)
+                    if self.fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+            except OSError as e:
+                # Keep it pending and carry on with the other blocks
+                self.dirty.add(name)
+                error = error or e
+                continue
+            block.disk_fingerprint = fingerprint
+        
+        if error is not None:
+            raise error
+    
+    def close(self):
+        """Stop the background threads and persist pending writes"""
+        self._stop_workers()
+        self.flush()
+    
+    def _close_at_exit(self):
+        """Close from the exit hook, logging instead of raising if the last flush fails"""
+        self._stop_workers()
+        self._flush_pending()
+    
+    def _stop_workers(self):
+        """Signal both worker threads to exit and wait for them"""
+        _open_instances.discard(self)
+        self._closed.set()
+        self._reorg_wake.set()
+        for thread in (self._flush_thread, self._reorg_thread):
+            if thread is not threading.current_thread():
+                thread.join()
+    
+    def _flush_pending(self):
+        """Final flush with no caller to raise to; failures are logged"""
+        try:
+            self.flush()
+        except OSError as e:
+            logger.warning("Could not persist pending memory writes: %s", e)
     
     def _validate_path(self, path: str) -> Tuple[str, Path]:
         """Validate path and return clean name + full path"""
@@ -239,18 +722,11 @@ class AdvancedMemory(MemoryInterface):
     
     def _find_in_tiers(self, clean_name: str) -> Optional[Tuple[MemoryTier, MemoryBlock]]:
         """Find a memory across all tiers"""
-        # Check predicted set first (optimization)
-        if clean_name in self.predicted_next:
-            for tier in [MemoryTier.WORKING, MemoryTier.ARCHIVAL]:
-                if clean_name in self.memory_blocks[tier]:
-                    return tier, self.memory_blocks[tier][clean_name]
-        
-        # Check each tier in order of likelihood
-        for tier in MemoryTier:
-            if clean_name in self.memory_blocks[tier]:
-                return tier, self.memory_blocks[tier][clean_name]
-        
-        return None
+        # Blocks carry their own tier, so one lookup in the flat index is enough
+        block = self.index.get(clean_name)
+        if block is None:
+            return None
+        return block.tier, block
     
     def handle_tool_call(self, tool_input: Dict[str, Any]) -> str:
         """Handle tool call with smart routing"""
@@ -259,16 +735,7 @@ class AdvancedMemory(MemoryInterface):
         if not command:
             return "Error: No command specified"
         
-        handlers = {
-            "view": self._handle_view,
-            "create": self._handle_create,
-            "str_replace": self._handle_str_replace,
-            "insert": self._handle_insert,
-            "delete": self._handle_delete,
-            "rename": self._handle_rename
-        }
-        
-        handler = handlers.get(command)
+        handler = self._handlers.get(command)
         if not handler:
             return f"Error: Unknown command '{command}'"
         
@@ -290,29 +757,25 @@ class AdvancedMemory(MemoryInterface):
         
         return self.view(path, view_range)
     
+    @_synchronized
     def view(self, path: str, view_range: Optional[List[int]] = None) -> str:
         """View with smart routing across tiers"""
         clean_name, base = self._validate_path(path)
         
         # Handle root directory listing
         if path in ["/memories", ""]:
-            items = []
-            
             # Show items from all tiers with tier indicator
-            for tier in MemoryTier:
-                for name, block in self.memory_blocks[tier].items():
-                    tier_indicator = {
-                        MemoryTier.WORKING: "🔥",   # Hot
-                        MemoryTier.ARCHIVAL: "📚",  # Warm
-                        MemoryTier.OVERFLOW: "🧊"   # Cold
-                    }[tier]
-                    
-                    items.append(f"{tier_indicator} {name} ({block.size_bytes}B, tier: {tier.value})")
+            items = [
+                f"{self._TIER_ICONS[tier]} {name} ({block.size_bytes}B, tier: {tier.value})"
+                for tier in MemoryTier
+                for name, block in self.memory_blocks[tier].items()
+            ]
             
             if not items:
                 return "Directory: /memories\n(empty)"
             
-            return f"Directory: /memories\n" + "\n".join(sorted(items))
+            items.sort()
+            return "Directory: /memories\n" + "\n".join(items)
         
         # Find file in tiers
         result = self._find_in_tiers(clean_name)
@@ -322,50 +785,73 @@ class AdvancedMemory(MemoryInterface):
         tier, block = result
         
         # Update access statistics
-        block.update_access()
-        self.access_patterns[clean_name].append(datetime.now().timestamp())
-        
-        # Predict next access
+        now = time.time()
+        block.update_access(now)
+        self._touch(clean_name, block)
+        self.access_patterns[clean_name].append(now)
+        self.freq_sketch.add(clean_name)
+        self._record_coaccess(clean_name)
+        
+        # Predict next access and warm the page cache for it
         self._predict_next_access(clean_name)
+        self._prefetch_predicted()
         
         # Track tier-specific latency
-        self.operation_counts[f'view_{tier.value}'] += 1
+        self.operation_counts[self._VIEW_KEYS[tier]] += 1
         
-        content = block.content
+        content = self._ensure_loaded(clean_name, block)
         if view_range:
-            lines = content.splitlines()
             start, end = view_range
-            start = max(0, start - 1)
-            end = min(len(lines), end)
-            return "\n".join(lines[start:end])
+            return _slice_lines(content, start, end)
         
         return content
     
+    @_synchronized
     def create(self, path: str, file_text: str) -> str:
         """Create with intelligent tier placement"""
         clean_name, base = self._validate_path(path)
         
+        # Overwrite replaces any existing block, wherever it lives
+        existing = self._find_in_tiers(clean_name)
+        if existing:
+            old_tier, old_block = existing
+            del self.memory_blocks[old_tier][clean_name]
+            del self.index[clean_name]
+            self.tier_size_bytes[old_tier] -= old_block.size_bytes
+        
         # Determine appropriate tier
-        tier = self._determine_tier(clean_name, file_text)
+        now = time.time()
+        tier = self._determine_tier(clean_name, file_text, now)
+        
+        if existing and existing[0] != tier:
+            old_file = self.tier_paths[existing[0]] / clean_name
+            if old_file.exists():
+                old_file.unlink()
         
         # Create memory block
         block = MemoryBlock(
             content=file_text,
             tier=tier,
-            created_at=datetime.now().timestamp(),
-            last_access=datetime.now().timestamp(),
+            created_at=now,
+            last_access=now,
             size_bytes=len(file_text)
         )
         
+        # Same tier means the same file, so its on-disk fingerprint still holds
+        if existing and existing[0] == tier:
+            block.disk_fingerprint = existing[1].disk_fingerprint
+        
         # Store in tier
         self.memory_blocks[tier][clean_name] = block
+        self.index[clean_name] = block
+        self.tier_size_bytes[tier] += block.size_bytes
         
-        # Write to filesystem
-        tier_path = self.tier_paths[tier] / clean_name
-        tier_path.write_text(file_text, encoding="utf-8")
+        # Persisted by the next flush
+        self.dirty.add(clean_name)
         
         return f"Created file: {path} (tier: {tier.value})"
     
+    @_synchronized
     def str_replace(self, path: str, old_str: str, new_str: str) -> str:
         """Replace with tier management"""
         clean_name, base = self._validate_path(path)
@@ -375,27 +861,34 @@ class AdvancedMemory(MemoryInterface):
             return f"Error: File does not exist: {path}"
         
         tier, block = result
+        self._ensure_loaded(clean_name, block)
         
-        if old_str not in block.content:
+        if not old_str:
+            return "Error: old_str must not be empty"
+        
+        # One scan yields both the occurrence count and the pieces to rejoin
+        parts = block.content.split(old_str)
+        count = len(parts) - 1
+        if count == 0:
             return "Error: String not found in file"
         
-        count = block.content.count(old_str)
-        block.content = block.content.replace(old_str, new_str)
+        old_size = block.size_bytes
+        block.content = new_str.join(parts)
         block.size_bytes = len(block.content)
-        block.update_access()
+        self.tier_size_bytes[tier] += block.size_bytes - old_size
+        now = time.time()
+        block.update_access(now)
+        self._touch(clean_name, block)
         
         # Check if tier change needed due to size
-        new_tier = self._determine_tier(clean_name, block.content)
-        if new_tier != tier:
-            self._move_between_tiers(clean_name, tier, new_tier)
-            tier = new_tier
+        self._retier_if_resized(clean_name, block, old_size, now)
         
-        # Write to filesystem
-        tier_path = self.tier_paths[tier] / clean_name
-        tier_path.write_text(block.content, encoding="utf-8")
+        # Persisted by the next flush
+        self.dirty.add(clean_name)
         
         return f"Replaced {count} occurrence(s) in {path}"
     
+    @_synchronized
     def insert(self, path: str, insert_line: int, insert_text: str) -> str:
         """Insert with tier awareness"""
         clean_name, base = self._validate_path(path)
@@ -408,31 +901,28 @@ class AdvancedMemory(MemoryInterface):
             return f"Error: Cannot insert at line {insert_line} in non-existent file"
         
         tier, block = result
-        lines = block.content.splitlines()
+        self._ensure_loaded(clean_name, block)
         
         if insert_line < 0:
             return "Error: Line number must be non-negative"
         
-        while len(lines) < insert_line:
-            lines.append("")
-        
-        lines.insert(insert_line, insert_text)
-        block.content = "\n".join(lines)
+        old_size = block.size_bytes
+        block.content = _insert_line(block.content, insert_line, insert_text)
         block.size_bytes = len(block.content)
-        block.update_access()
+        self.tier_size_bytes[tier] += block.size_bytes - old_size
+        now = time.time()
+        block.update_access(now)
+        self._touch(clean_name, block)
         
         # Check tier change
-        new_tier = self._determine_tier(clean_name, block.content)
-        if new_tier != tier:
-            self._move_between_tiers(clean_name, tier, new_tier)
-            tier = new_tier
+        self._retier_if_resized(clean_name, block, old_size, now)
         
-        # Write to filesystem
-        tier_path = self.tier_paths[tier] / clean_name
-        tier_path.write_text(block.content, encoding="utf-8")
+        # Persisted by the next flush
+        self.dirty.add(clean_name)
         
         return f"Inserted text at line {insert_line} in {path}"
     
+    @_synchronized
     def delete(self, path: str) -> str:
         """Delete from appropriate tier"""
         clean_name, base = self._validate_path(path)
@@ -445,18 +935,24 @@ class AdvancedMemory(MemoryInterface):
         
         # Remove from memory
         del self.memory_blocks[tier][clean_name]
+        del self.index[clean_name]
+        self.tier_size_bytes[tier] -= block.size_bytes
         
         # Remove from filesystem
         tier_path = self.tier_paths[tier] / clean_name
         if tier_path.exists():
             tier_path.unlink()
         
+        self.dirty.discard(clean_name)
+        
         # Clean up patterns
         self.access_patterns.pop(clean_name, None)
         self.predicted_next.discard(clean_name)
+        self._forget_coaccess(clean_name)
         
         return f"Deleted file: {path}"
     
+    @_synchronized
     def rename(self, old_path: str, new_path: str) -> str:
         """Rename across tiers"""
         old_name, _ = self._validate_path(old_path)
@@ -475,6 +971,8 @@ class AdvancedMemory(MemoryInterface):
         # Move in memory
         del self.memory_blocks[tier][old_name]
         self.memory_blocks[tier][new_name] = block
+        del self.index[old_name]
+        self.index[new_name] = block
         
         # Move on filesystem
         old_tier_path = self.tier_paths[tier] / old_name
@@ -482,10 +980,15 @@ class AdvancedMemory(MemoryInterface):
         
         if old_tier_path.exists():
             old_tier_path.rename(new_tier_path)
+        if old_name in self.dirty:
+            self.dirty.discard(old_name)
+            self.dirty.add(new_name)
         
         # Update patterns
         if old_name in self.access_patterns:
             self.access_patterns[new_name] = self.access_patterns.pop(old_name)
+        self._rename_coaccess(old_name, new_name)
+        self.freq_sketch.add(new_name, self.freq_sketch.estimate(old_name))
         
         return f"Renamed {old_path} to {new_path}"
     
@@ -525,12 +1028,13 @@ class AdvancedMemory(MemoryInterface):
             return "Error: Both paths required"
         return self.rename(old_path, new_path)
     
+    @_synchronized
     def get_metrics(self) -> Dict[str, Any]:
         """Return advanced metrics"""
         tier_stats = {}
         for tier in MemoryTier:
             blocks = self.memory_blocks[tier]
-            total_size = sum(b.size_bytes for b in blocks.values())
+            total_size = self.tier_size_bytes[tier]
             
             tier_stats[tier.value] = {
                 'count': len(blocks),
@@ -539,11 +1043,11 @@ class AdvancedMemory(MemoryInterface):
             }
         
         # Calculate hit rates by tier
-        total_views = sum(self.operation_counts.get(f'view_{tier.value}', 0) for tier in MemoryTier)
+        total_views = sum(self.operation_counts.get(self._VIEW_KEYS[tier], 0) for tier in MemoryTier)
         tier_hit_rates = {}
         if total_views > 0:
             for tier in MemoryTier:
-                hits = self.operation_counts.get(f'view_{tier.value}', 0)
+                hits = self.operation_counts.get(self._VIEW_KEYS[tier], 0)
                 tier_hit_rates[tier.value] = round(hits / total_views * 100, 1)
         
         return {
@@ -551,6 +1055,7 @@ class AdvancedMemory(MemoryInterface):
             'tier_statistics': tier_stats,
             'tier_hit_rates': tier_hit_rates,
             'predicted_next_count': len(self.predicted_next),
+            'pending_writes': len(self.dirty),
             'reorganizations': self.reorganize_counter,
             'latency_report': self.tracker.report() if self.tracker.metrics else {},
             'implementation': 'advanced_memory'
@@ -10,15 +10,238 @@ Features:
 - Supports all 6 official commands: view, create, str_replace, insert, delete, rename
 """
 
+import io
 import os
-import shutil
+import mmap
+import stat
+import tempfile
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 import sys
 sys.path.append('..')
-from memory_interface import MemoryInterface
+from memory_interface import MemoryInterface, resolves_outside
 # Removed latency tracking for clean testing
 
+# Chunk size for streaming edits and write buffer for rewritten files
+_READ_CHUNK = 256 * 1024
+_WRITE_BUFFER = 1 << 20
+_O_RDONLY = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+# Anything modified this recently may change again without its mtime moving
+_RACY_NS = 2 * 10**9
+
+# Official tool definition, shared by every get_tool_definition() call
+_TOOL_DEFINITION = {
+    "type": "memory_20250818",
+    "name": "memory"
+}
+
+# Commands that handle_tool_calls can run against a shared in-memory copy
+_FILE_COMMANDS = frozenset({"view", "str_replace", "insert"})
+
+
+def _normalize_newlines(data: bytes) -> bytes:
+    """The universal-newline translation text-mode reads apply: CRLF and lone CR become LF"""
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return data
+
+
+def _settled(st: os.stat_result) -> bool:
+    """Whether st is old enough for its mtime to vouch for the contents"""
+    return time.time_ns() - st.st_mtime_ns > _RACY_NS
+
+
+def _read_file(path, size: int) -> bytes:
+    """Read a whole file with raw os calls, skipping buffered-IO setup"""
+    fd = os.open(path, _O_RDONLY)
+    try:
+        # Size the first read from stat, but only an empty read means EOF:
+        # read() may return short (large files, network filesystems)
+        chunks = [os.read(fd, size + 1)]
+        while chunks[-1]:
+            chunks.append(os.read(fd, _READ_CHUNK))
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _discard(path: str) -> None:
+    """Remove a leftover temp file, if there is one"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _umask() -> int:
+    """Current process umask (it can only be read by setting it)"""
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+def _open_replacement(path: str):
+    """
+    Uniquely named temp file that will replace the file `path` points to.
+    
+    Symlinks are followed first, so replacing writes through them to the
+    target instead of swapping a regular file in for the link.
+    Returns (file, tmp_path, real_path).
+    """
+    real_path = os.path.realpath(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=os.path.dirname(real_path))
+    return open(fd, "wb", buffering=_WRITE_BUFFER), tmp_path, real_path
+
+
+def _commit_replacement(tmp_path: str, real_path: str) -> None:
+    """Give the temp file the target's permissions and swap it in"""
+    try:
+        mode = stat.S_IMODE(os.stat(real_path).st_mode)
+    except FileNotFoundError:
+        # New file: the mode a plain open() would have created it with
+        mode = 0o666 & ~_umask()
+    os.chmod(tmp_path, mode)
+    os.replace(tmp_path, real_path)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write data to a temp file and swap it in, so readers never see a torn file"""
+    f, tmp_path, real_path = _open_replacement(path)
+    try:
+        with f:
+            f.write(data)
+        _commit_replacement(tmp_path, real_path)
+    except BaseException:
+        _discard(tmp_path)
+        raise
+
+
+def _normalized_chunks(src):
+    """Read src in _READ_CHUNK pieces with newlines normalized, never splitting a CRLF"""
+    pending = b""
+    while True:
+        chunk = src.read(_READ_CHUNK)
+        if not chunk:
+            break
+        chunk = pending + chunk
+        # A trailing CR may be the first half of a CRLF in the next chunk
+        pending = b"\r" if chunk.endswith(b"\r") else b""
+        yield _normalize_newlines(chunk[:len(chunk) - len(pending)])
+    if pending:
+        yield b"\n"
+
+
+def _stream_replace(chunks, dst, old: bytes, new: bytes) -> int:
+    """Copy chunks to dst replacing every `old` with `new`, returning the count"""
+    count = 0
+    carry = b""
+    overlap = len(old) - 1
+    
+    for chunk in chunks:
+        window = carry + chunk
+        view = memoryview(window)
+        
+        pos = 0
+        while True:
+            hit = window.find(old, pos)
+            if hit < 0:
+                break
+            dst.write(view[pos:hit])
+            dst.write(new)
+            pos = hit + len(old)
+            count += 1
+        
+        # Hold back a tail that could be the start of a match split across chunks
+        cut = max(pos, len(window) - overlap)
+        dst.write(view[pos:cut])
+        carry = window[cut:]
+    
+    dst.write(carry)
+    return count
+
+
+def _replace_all(data: bytes, old: bytes, new: bytes) -> Tuple[bytes, int]:
+    """bytes.replace plus the number of matches, in a single scan"""
+    delta = len(old) - len(new)
+    if delta:
+        # Every match changes the length by the same amount
+        replaced = data.replace(old, new)
+        return replaced, (len(data) - len(replaced)) // delta
+    
+    # Same-length swap: count first so a miss costs one scan, not two
+    count = data.count(old)
+    return (data.replace(old, new) if count else data), count
+
+
+def _slice_lines(data: bytes, start: int, end: int) -> bytes:
+    """Lines start..end (1-based, inclusive) without splitting the whole file"""
+    first = max(0, start - 1)
+    if end < 0:
+        # Negative ends keep plain list-slice semantics
+        return b"\n".join(data.splitlines()[first:end])
+    
+    begin = 0
+    for _ in range(first):
+        nl = data.find(b"\n", begin)
+        if nl < 0:
+            return b""
+        begin = nl + 1
+    
+    stop = pos = begin
+    for taken in range(end - first):
+        nl = data.find(b"\n", pos)
+        if nl < 0:
+            # Hit EOF; a trailing newline doesn't start another line
+            return data[begin:stop] if taken and pos == len(data) else data[begin:]
+        stop, pos = nl, nl + 1
+    return data[begin:stop]
+
+
+def _map_file(f):
+    """Read-only buffer over an open file, via mmap where possible"""
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        # Empty files (and some filesystems) can't be mapped
+        return f.read()
+
+
+def _nth_newline(buf, n: int) -> Tuple[int, int]:
+    """Offset of the n-th newline in buf (1-based) and how many were seen"""
+    pos = -1
+    for seen in range(n):
+        pos = buf.find(b"\n", pos + 1)
+        if pos < 0:
+            return -1, seen
+    return pos, n
+
+
+def _write_with_line(dst, buf, insert_line: int, text: bytes) -> None:
+    """Write buf to dst with `text` spliced in as line `insert_line`"""
+    if insert_line == 0:
+        dst.write(text)
+        if len(buf):
+            dst.write(b"\n")
+            dst.write(buf)
+        return
+    
+    pos, seen = _nth_newline(buf, insert_line)
+    with memoryview(buf) as view:
+        if pos >= 0:
+            dst.write(view[:pos])
+            dst.write(b"\n" + text)
+            dst.write(view[pos:])
+            return
+        
+        # Past the last line: append, padding the gap with empty lines
+        dst.write(view)
+    line_count = seen + 1 if len(buf) else 0
+    dst.write(b"\n" * (insert_line - line_count + (1 if len(buf) else 0)))
+    dst.write(text)
+
 
 class ClaudeOfficialMemory(MemoryInterface):
     """
@@ -29,10 +252,16 @@ class ClaudeOfficialMemory(MemoryInterface):
     - https://github.com/anthropics/anthropic-sdk-python/blob/main/examples/memory/basic.py
     """
     
+    # Content cache bounds: entry count and largest file worth keeping
+    FILE_CACHE_ENTRIES = 32
+    FILE_CACHE_MAX_BYTES = 256 * 1024
+    
     def __init__(self, base_path: str = "./memories"):
         """Initialize with base memory directory"""
         self.base_path = Path(base_path).resolve()
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self._base_str = str(self.base_path)
+        self._base_prefix = os.path.join(self._base_str, "")
         
         # Removed latency tracking for clean testing
         
@@ -45,6 +274,25 @@ class ClaudeOfficialMemory(MemoryInterface):
             'delete': 0,
             'rename': 0
         }
+        
+        # Rendered /memories listing and the root's mtime_ns when it was rendered
+        self._root_listing: Optional[Tuple[int, str]] = None
+        
+        # Recently viewed files: path -> ((mtime_ns, size, ino), bytes), in LRU order
+        self._file_cache = OrderedDict()
+        
+        # In-memory file copies shared by a handle_tool_calls run
+        self._buffers: Dict[str, bytes] = {}
+        
+        # Command dispatch table, bound once
+        self._handlers = {
+            "view": self._handle_view,
+            "create": self._handle_create,
+            "str_replace": self._handle_str_replace,
+            "insert": self._handle_insert,
+            "delete": self._handle_delete,
+            "rename": self._handle_rename
+        }
     
     def get_tool_definition(self) -> Dict[str, Any]:
         """
@@ -52,12 +300,9 @@ class ClaudeOfficialMemory(MemoryInterface):
         
         As per docs, this is the minimal definition needed.
         """
-        return {
-            "type": "memory_20250818",
-            "name": "memory"
-        }
+        return _TOOL_DEFINITION
     
-    def _validate_path(self, path: str) -> Path:
+    def _validate_path(self, path: str) -> str:
         """
         Validate and resolve path with security checks.
         
@@ -69,13 +314,15 @@ class ClaudeOfficialMemory(MemoryInterface):
         if path.startswith("/"):
             path = path[1:]
         
-        # Resolve full path
-        full_path = (self.base_path / path).resolve()
+        # Lexical normalization catches '..' escapes without touching the disk
+        full_path = os.path.normpath(os.path.join(self._base_str, path))
         
         # Security check - ensure path is within base directory
-        try:
-            full_path.relative_to(self.base_path)
-        except ValueError:
+        if full_path != self._base_str and not full_path.startswith(self._base_prefix):
+            raise ValueError(f"Path traversal detected: {path}")
+        
+        # Symlinks inside the tree could still lead out of it
+        if resolves_outside(self._base_str, full_path):
             raise ValueError(f"Path traversal detected: {path}")
         
         return full_path
@@ -91,17 +338,7 @@ class ClaudeOfficialMemory(MemoryInterface):
         if not command:
             return "Error: No command specified"
         
-        # Map commands to handlers
-        handlers = {
-            "view": self._handle_view,
-            "create": self._handle_create,
-            "str_replace": self._handle_str_replace,
-            "insert": self._handle_insert,
-            "delete": self._handle_delete,
-            "rename": self._handle_rename
-        }
-        
-        handler = handlers.get(command)
+        handler = self._handlers.get(command)
         if not handler:
             return f"Error: Unknown command '{command}'"
         
@@ -111,6 +348,60 @@ class ClaudeOfficialMemory(MemoryInterface):
         except Exception as e:
             return f"Error: {str(e)}"
     
+    def handle_tool_calls(self, tool_inputs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Handle all tool calls from one assistant turn, in order.
+        
+        Back-to-back view/str_replace/insert calls on the same file share a
+        single read and a single atomic write-back.
+        """
+        results = []
+        i = 0
+        while i < len(tool_inputs):
+            path = tool_inputs[i].get("path")
+            j = i + 1
+            if path and tool_inputs[i].get("command") in _FILE_COMMANDS:
+                while (j < len(tool_inputs)
+                       and tool_inputs[j].get("command") in _FILE_COMMANDS
+                       and tool_inputs[j].get("path") == path):
+                    j += 1
+            
+            if j - i > 1:
+                results.extend(self._handle_file_run(path, tool_inputs[i:j]))
+            else:
+                results.append(self.handle_tool_call(tool_inputs[i]))
+            i = j
+        
+        return results
+    
+    def _handle_file_run(self, path: str, tool_inputs: List[Dict[str, Any]]) -> List[str]:
+        """Run consecutive calls on one file against an in-memory copy"""
+        try:
+            resolved_path = self._validate_path(path)
+            st = os.stat(resolved_path)
+        except (ValueError, OSError):
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
+            # Missing files, directories and bad paths keep their per-call errors
+            return [self.handle_tool_call(tool_input) for tool_input in tool_inputs]
+        
+        original = _normalize_newlines(_read_file(resolved_path, st.st_size))
+        self._buffers[resolved_path] = original
+        try:
+            results = [self.handle_tool_call(tool_input) for tool_input in tool_inputs]
+            data = self._buffers[resolved_path]
+        finally:
+            del self._buffers[resolved_path]
+        
+        if data is not original:
+            try:
+                _write_atomic(resolved_path, data)
+            except Exception as e:
+                # Nothing from the run reached disk
+                return [f"Error: {str(e)}"] * len(tool_inputs)
+        
+        return results
+    
     def _handle_view(self, input_data: Dict[str, Any]) -> str:
         """Handle view command - show directory or file contents"""
         path = input_data.get("path", "/memories")
@@ -122,42 +413,84 @@ class ClaudeOfficialMemory(MemoryInterface):
         """View directory or file contents"""
         resolved_path = self._validate_path(path)
         
-        # Handle root memories directory
-        if not resolved_path.exists():
-            if resolved_path == self.base_path:
+        try:
+            st = os.stat(resolved_path)
+        except (FileNotFoundError, NotADirectoryError):
+            # Handle root memories directory
+            if resolved_path == self._base_str:
                 return "Directory: /memories\n(empty)"
             return f"Error: Path does not exist: {path}"
         
         # Directory listing
-        if resolved_path.is_dir():
-            items = sorted(resolved_path.iterdir())
-            if not items:
-                return f"Directory: {path}\n(empty)"
+        if stat.S_ISDIR(st.st_mode):
+            if resolved_path != self._base_str:
+                return f"Directory: {path}\n{self._list_directory(resolved_path)}"
             
-            lines = [f"Directory: {path}"]
-            for item in items:
-                if item.is_dir():
-                    lines.append(f"- 📁 {item.name}")
-                else:
-                    size = item.stat().st_size
-                    lines.append(f"- 📄 {item.name} ({size} bytes)")
+            # Root listing is reused while the root's mtime is unchanged, so
+            # entries added or removed by other processes are picked up too
+            cached = self._root_listing
+            if cached is not None and cached[0] == st.st_mtime_ns:
+                return f"Directory: {path}\n{cached[1]}"
             
-            return "\n".join(lines)
+            listing = self._list_directory(resolved_path)
+            self._root_listing = (st.st_mtime_ns, listing) if _settled(st) else None
+            return f"Directory: {path}\n{listing}"
         
         # File contents
         else:
-            content = resolved_path.read_text(encoding="utf-8")
-            lines = content.splitlines()
+            data = self._buffers.get(resolved_path)
+            if data is None:
+                data = self._read_cached(resolved_path, st)
             
             if view_range:
+                # Scan to the requested lines and decode only those
                 start, end = view_range
-                # Convert to 0-indexed
-                start = max(0, start - 1)
-                end = min(len(lines), end)
-                lines = lines[start:end]
-                return "\n".join(lines)
+                return _slice_lines(data, start, end).decode("utf-8")
             
-            return content
+            return data.decode("utf-8")
+    
+    def _read_cached(self, resolved_path: str, st: os.stat_result) -> bytes:
+        """File bytes with newlines normalized, reused while mtime, size and inode are unchanged (settled files only)"""
+        key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        entry = self._file_cache.get(resolved_path)
+        if entry is not None and entry[0] == key:
+            self._file_cache.move_to_end(resolved_path)
+            return entry[1]
+        
+        data = _normalize_newlines(_read_file(resolved_path, st.st_size))
+        # A same-size rewrite within the mtime granularity would look unchanged
+        if len(data) <= self.FILE_CACHE_MAX_BYTES and _settled(st):
+            self._file_cache[resolved_path] = (key, data)
+            self._file_cache.move_to_end(resolved_path)
+            if len(self._file_cache) > self.FILE_CACHE_ENTRIES:
+                self._file_cache.popitem(last=False)
+        return data
+    
+    def _invalidate(self, resolved_path: Optional[str] = None) -> None:
+        """Drop cached views a mutation could make stale (all files if no path)"""
+        self._root_listing = None
+        if resolved_path is None:
+            self._file_cache.clear()
+        else:
+            self._file_cache.pop(resolved_path, None)
+    
+    def _list_directory(self, resolved_path: str) -> str:
+        """Render the entries of a directory, one per line"""
+        # scandir entries carry d_type, so is_dir() needs no extra stat
+        with os.scandir(resolved_path) as it:
+            items = sorted(it, key=lambda entry: entry.name)
+        if not items:
+            return "(empty)"
+        
+        lines = []
+        for item in items:
+            if item.is_dir():
+                lines.append(f"- 📁 {item.name}")
+            else:
+                size = item.stat().st_size
+                lines.append(f"- 📄 {item.name} ({size} bytes)")
+        
+        return "\n".join(lines)
     
     def _handle_create(self, input_data: Dict[str, Any]) -> str:
         """Handle create command"""
@@ -169,15 +502,19 @@ class ClaudeOfficialMemory(MemoryInterface):
         
         return self.create(path, file_text)
     
-    def create(self, path: str, file_text: str) -> str:
-        """Create or overwrite a file"""
+    def create(self, path: str, file_text: Union[str, bytes]) -> str:
+        """Create or overwrite a file (file_text may already be UTF-8 bytes)"""
         resolved_path = self._validate_path(path)
+        self._invalidate(resolved_path)
         
         # Create parent directories if needed
-        resolved_path.parent.mkdir(parents=True, exist_ok=True)
+        os.makedirs(os.path.dirname(resolved_path), exist_ok=True)
         
-        # Write file
-        resolved_path.write_text(file_text, encoding="utf-8")
+        # Pre-encoded content is written as-is
+        data = file_text if isinstance(file_text, bytes) else file_text.encode("utf-8")
+        
+        # Write to a temp file and swap it in, so a crash never leaves a torn file
+        _write_atomic(resolved_path, data)
         
         return f"Created file: {path}"
     
@@ -195,25 +532,55 @@ class ClaudeOfficialMemory(MemoryInterface):
     def str_replace(self, path: str, old_str: str, new_str: str) -> str:
         """Replace text in a file"""
         resolved_path = self._validate_path(path)
+        self._invalidate(resolved_path)
         
-        if not resolved_path.exists():
+        try:
+            st = os.stat(resolved_path)
+        except (FileNotFoundError, NotADirectoryError):
             return f"Error: File does not exist: {path}"
         
-        if resolved_path.is_dir():
+        if stat.S_ISDIR(st.st_mode):
             return f"Error: Cannot replace text in directory: {path}"
         
-        content = resolved_path.read_text(encoding="utf-8")
-        
-        if old_str not in content:
+        if not old_str:
+            return "Error: old_str must not be empty"
+        
+        old_bytes = old_str.encode("utf-8")
+        new_bytes = new_str.encode("utf-8")
+        
+        # Batched calls edit the run's shared in-memory copy
+        buffered = self._buffers.get(resolved_path)
+        if buffered is not None:
+            content, count = _replace_all(buffered, old_bytes, new_bytes)
+            if not count:
+                return f"Error: String not found in file: {old_str[:50]}..."
+            self._buffers[resolved_path] = content
+            return f"Replaced {count} occurrence(s) in {path}"
+        
+        if st.st_size <= _READ_CHUNK:
+            # Files that fit in one chunk take a single C-level replace. Matching
+            # runs on normalized newlines, as it did on text-mode reads
+            data = _normalize_newlines(_read_file(resolved_path, st.st_size))
+            content, count = _replace_all(data, old_bytes, new_bytes)
+            if count:
+                _write_atomic(resolved_path, content)
+        else:
+            # Replace and count in one pass, streaming into a temp file that replaces the original
+            dst, tmp_path, real_path = _open_replacement(resolved_path)
+            try:
+                with open(resolved_path, "rb", buffering=0) as src, dst:
+                    count = _stream_replace(_normalized_chunks(src), dst, old_bytes, new_bytes)
+                if count:
+                    _commit_replacement(tmp_path, real_path)
+            except BaseException:
+                _discard(tmp_path)
+                raise
+            if not count:
+                _discard(tmp_path)
+        
+        if not count:
             return f"Error: String not found in file: {old_str[:50]}..."
         
-        # Count occurrences
-        count = content.count(old_str)
-        
-        # Replace all occurrences
-        new_content = content.replace(old_str, new_str)
-        resolved_path.write_text(new_content, encoding="utf-8")
-        
         return f"Replaced {count} occurrence(s) in {path}"
     
     def _handle_insert(self, input_data: Dict[str, Any]) -> str:
@@ -230,35 +597,50 @@ class ClaudeOfficialMemory(MemoryInterface):
     def insert(self, path: str, insert_line: int, insert_text: str) -> str:
         """Insert text at a specific line"""
         resolved_path = self._validate_path(path)
+        self._invalidate(resolved_path)
         
-        if not resolved_path.exists():
+        try:
+            st = os.stat(resolved_path)
+        except (FileNotFoundError, NotADirectoryError):
             # Create new file if it doesn't exist
             if insert_line == 0:
-                resolved_path.write_text(insert_text, encoding="utf-8")
+                with open(resolved_path, "xb") as f:
+                    f.write(insert_text.encode("utf-8"))
                 return f"Created new file with content at {path}"
             else:
                 return f"Error: Cannot insert at line {insert_line} in non-existent file"
         
-        if resolved_path.is_dir():
+        if stat.S_ISDIR(st.st_mode):
             return f"Error: Cannot insert text into directory: {path}"
         
-        content = resolved_path.read_text(encoding="utf-8")
-        lines = content.splitlines()
-        
         # Handle line number bounds
         if insert_line < 0:
             return "Error: Line number must be non-negative"
         
-        if insert_line > len(lines):
-            # Pad with empty lines if needed
-            while len(lines) < insert_line:
-                lines.append("")
-        
-        # Insert the text
-        lines.insert(insert_line, insert_text)
+        # Batched calls edit the run's shared in-memory copy
+        buffered = self._buffers.get(resolved_path)
+        if buffered is not None:
+            out = io.BytesIO()
+            _write_with_line(out, buffered, insert_line, insert_text.encode("utf-8"))
+            self._buffers[resolved_path] = out.getvalue()
+            return f"Inserted text at line {insert_line} in {path}"
         
-        # Write back
-        resolved_path.write_text("\n".join(lines), encoding="utf-8")
+        # Splice the line in from a mapped view instead of splitting the file
+        dst, tmp_path, real_path = _open_replacement(resolved_path)
+        try:
+            with open(resolved_path, "rb") as src, dst:
+                mapped = _map_file(src)
+                try:
+                    # CR line ends are translated first, as a text-mode read did
+                    buf = mapped if mapped.find(b"\r") < 0 else _normalize_newlines(mapped[:])
+                    _write_with_line(dst, buf, insert_line, insert_text.encode("utf-8"))
+                finally:
+                    if isinstance(mapped, mmap.mmap):
+                        mapped.close()
+            _commit_replacement(tmp_path, real_path)
+        except BaseException:
+            _discard(tmp_path)
+            raise
         
         return f"Inserted text at line {insert_line} in {path}"
     
@@ -274,17 +656,22 @@ class ClaudeOfficialMemory(MemoryInterface):
     def delete(self, path: str) -> str:
         """Delete a file or directory"""
         resolved_path = self._validate_path(path)
+        # Deleting a directory can affect any cached file under it
+        self._invalidate()
         
-        if not resolved_path.exists():
+        try:
+            st = os.stat(resolved_path)
+        except (FileNotFoundError, NotADirectoryError):
             return f"Error: Path does not exist: {path}"
         
-        if resolved_path.is_dir():
-            # Remove directory and all contents
+        if stat.S_ISDIR(st.st_mode):
+            # Remove directory and all contents (shutil is only needed here)
+            import shutil
             shutil.rmtree(resolved_path)
             return f"Deleted directory: {path}"
         else:
             # Remove file
-            resolved_path.unlink()
+            os.unlink(resolved_path)
             return f"Deleted file: {path}"
     
     def _handle_rename(self, input_data: Dict[str, Any]) -> str:
@@ -301,18 +688,44 @@ class ClaudeOfficialMemory(MemoryInterface):
         """Rename or move a file/directory"""
         old_resolved = self._validate_path(old_path)
         new_resolved = self._validate_path(new_path)
-        
-        if not old_resolved.exists():
+        # Moving a directory can affect any cached file under it
+        self._invalidate()
+        
+        # Files: link() refuses an existing destination atomically, where
+        # rename() would silently replace it, so no exists() probes are needed
+        for attempt in range(2):
+            try:
+                os.link(old_resolved, new_resolved)
+            except FileExistsError:
+                return f"Error: Destination already exists: {new_path}"
+            except FileNotFoundError:
+                if attempt or not os.path.lexists(old_resolved):
+                    return f"Error: Source path does not exist: {old_path}"
+                # Destination directory is missing; create it and retry once
+                os.makedirs(os.path.dirname(new_resolved), exist_ok=True)
+                continue
+            except OSError:
+                # Directories (or no hard-link support): checked rename below
+                break
+            try:
+                os.unlink(old_resolved)
+            except BaseException:
+                # Don't leave the file under both names
+                _discard(new_resolved)
+                raise
+            return f"Renamed {old_path} to {new_path}"
+        
+        if not os.path.exists(old_resolved):
             return f"Error: Source path does not exist: {old_path}"
         
-        if new_resolved.exists():
+        if os.path.exists(new_resolved):
             return f"Error: Destination already exists: {new_path}"
         
         # Create parent directories for destination if needed
-        new_resolved.parent.mkdir(parents=True, exist_ok=True)
+        os.makedirs(os.path.dirname(new_resolved), exist_ok=True)
         
         # Move/rename
-        old_resolved.rename(new_resolved)
+        os.rename(old_resolved, new_resolved)
         
         return f"Renamed {old_path} to {new_path}"
     
@@ -55,6 +55,7 @@ def run_conversation_with_memory(messages, memory_handler, max_turns=10):
         # Process tool uses and Claude's messages
         tool_results = []
         assistant_content = []
+        tool_uses = []
         
         for block in response.content:
             assistant_content.append(block)
@@ -65,12 +66,13 @@ def run_conversation_with_memory(messages, memory_handler, max_turns=10):
             elif block.type == "tool_use":
                 print(f"\n   🔧 MEMORY OPERATION: {block.name}")
                 print(f"      📥 Input: {block.input}")
-                
-                # Execute memory operation
-                result = memory_handler.handle_tool_call(block.input)
-                print(f"      📤 Result: {result}")
-                
-                tool_results.append(create_memory_tool_result(block.id, result))
+                tool_uses.append(block)
+        
+        # Execute the turn's memory operations as one batch
+        results = memory_handler.handle_tool_calls([block.input for block in tool_uses])
+        for block, result in zip(tool_uses, results):
+            print(f"      📤 Result ({block.input.get('command')}): {result}")
+            tool_results.append(create_memory_tool_result(block.id, result))
         
         # Add to conversation history
         messages.append({"role": "assistant", "content": assistant_content})
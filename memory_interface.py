@@ -4,10 +4,22 @@ Common interface for all memory implementations.
 This allows us to swap implementations for testing and benchmarking.
 """
 
+import os
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional, List
 
 
+def resolves_outside(base: str, full_path: str) -> bool:
+    """
+    Whether symlinks take full_path outside base.
+    
+    Deliberately not memoized: any rename, delete or create can change
+    where a path resolves, so a cached answer can become a sandbox escape.
+    """
+    real = os.path.realpath(full_path)
+    return real != base and not real.startswith(os.path.join(base, ""))
+
+
 class MemoryInterface(ABC):
     """Base interface that all memory implementations must follow"""
     
@@ -29,6 +41,20 @@ class MemoryInterface(ABC):
         """
         pass
     
+    def handle_tool_calls(self, tool_inputs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Handle a batch of memory tool calls in order.
+        
+        Implementations may override this to amortize per-call overhead.
+        
+        Args:
+            tool_inputs: Tool call inputs, as passed to handle_tool_call
+        
+        Returns:
+            Result strings, one per input
+        """
+        return [self.handle_tool_call(tool_input) for tool_input in tool_inputs]
+    
     @abstractmethod
     def get_tool_definition(self) -> Dict[str, Any]:
         """
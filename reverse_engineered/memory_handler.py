@@ -12,17 +12,70 @@ Key differences from official:
 
 import os
 import json
+import stat
+import errno
 import shutil
 import hashlib
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
-from collections import OrderedDict
 from datetime import datetime
 import sys
 sys.path.append('..')
-from memory_interface import MemoryInterface
+from memory_interface import MemoryInterface, resolves_outside
 from latency_benchmark import LatencyTracker, OperationType
 
+_READ_CHUNK = 256 * 1024
+_O_CLOEXEC_BINARY = getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+_O_READ = os.O_RDONLY | _O_CLOEXEC_BINARY
+_O_WRITE = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_CLOEXEC_BINARY
+
+
+def _read_text(path) -> str:
+    """Read a UTF-8 file with raw os calls instead of Path.read_text's IO stack"""
+    fd = os.open(path, _O_READ)
+    try:
+        st = os.fstat(fd)
+        if stat.S_ISDIR(st.st_mode):
+            raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), os.fspath(path))
+        
+        # Size the first read from fstat, but only an empty read means EOF:
+        # read() may return short (large files, network filesystems)
+        chunks = [os.read(fd, st.st_size + 1)]
+        while chunks[-1]:
+            chunks.append(os.read(fd, _READ_CHUNK))
+        data = b"".join(chunks)
+    finally:
+        os.close(fd)
+    
+    text = data.decode("utf-8")
+    # Same universal-newline translation read_text applies
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _write_text(path, text: str) -> None:
+    """Write a UTF-8 file with raw os calls instead of Path.write_text's IO stack"""
+    data = memoryview(text.encode("utf-8"))
+    fd = os.open(path, _O_WRITE, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+def _view_lines(entry: List, view_range: List[int]) -> str:
+    """Join a 1-based line range from a cache entry, splitting its content only once"""
+    lines = entry[1]
+    if lines is None:
+        lines = entry[1] = entry[0].splitlines()
+    
+    start, end = view_range
+    start = max(0, start - 1)
+    end = min(len(lines), end)
+    return "\n".join(lines[start:end])
+
 
 class ReverseEngineeredMemory(MemoryInterface):
     """
@@ -36,11 +89,17 @@ class ReverseEngineeredMemory(MemoryInterface):
         self.base_path = Path(base_path).resolve()
         self.base_path.mkdir(parents=True, exist_ok=True)
         
+        # String forms of the base for pathlib-free validation
+        self._base_str = str(self.base_path)
+        self._base_prefix = os.path.join(self._base_str, "")
+        self._base_prefix_len = len(self._base_prefix)  # Slices relative keys off resolved paths
+        
         # Latency tracking
         self.tracker = LatencyTracker(str(self.base_path))
         
-        # Cache for frequently accessed files (LRU)
-        self.cache = OrderedDict()
+        # Cache for frequently accessed files (LRU via dict insertion order)
+        # Entries are [content, lines], lines split lazily on the first ranged view
+        self.cache: Dict[str, List] = {}
         self.cache_size = 10  # Max files in cache
         
         # Index for fast searching
@@ -62,6 +121,16 @@ class ReverseEngineeredMemory(MemoryInterface):
             'cache_misses': 0
         }
         
+        # Command dispatch table, bound once
+        self._handlers = {
+            "view": self._handle_view,
+            "create": self._handle_create,
+            "str_replace": self._handle_str_replace,
+            "insert": self._handle_insert,
+            "delete": self._handle_delete,
+            "rename": self._handle_rename
+        }
+        
         # Build initial index
         self._rebuild_index()
     
@@ -74,54 +143,69 @@ class ReverseEngineeredMemory(MemoryInterface):
     
     def _rebuild_index(self):
         """Build an index of all files for faster access"""
-        self.index['files'].clear()
-        self.index['directories'].clear()
-        
-        for path in self.base_path.rglob('*'):
-            rel_path = str(path.relative_to(self.base_path))
-            
-            if path.is_dir():
-                self.index['directories'].add(rel_path)
-            else:
-                self.index['files'][rel_path] = {
-                    'size': path.stat().st_size,
-                    'modified': path.stat().st_mtime,
-                    'hash': None  # Computed on demand
-                }
+        files = self.index['files']
+        directories = self.index['directories']
+        files.clear()
+        directories.clear()
+        
+        # scandir walk: DirEntry knows its type, so only files need a stat
+        pending = [self._base_str]
+        while pending:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    rel_path = entry.path[self._base_prefix_len:]
+                    
+                    if entry.is_dir():
+                        directories.add(rel_path)
+                        if not entry.is_symlink():
+                            pending.append(entry.path)
+                    else:
+                        st = entry.stat()
+                        files[rel_path] = {
+                            'size': st.st_size,
+                            'modified': st.st_mtime,
+                            'hash': None  # Computed on demand
+                        }
         
         self.index['last_scan'] = datetime.now().isoformat()
     
-    def _get_from_cache(self, path: str) -> Optional[str]:
-        """Get file content from cache if available"""
-        if path in self.cache:
-            # Move to end (most recently used)
-            self.cache.move_to_end(path)
-            self.operation_counts['cache_hits'] += 1
-            return self.cache[path]
-        
-        self.operation_counts['cache_misses'] += 1
-        return None
+    def _get_from_cache(self, path: str) -> Optional[List]:
+        """Get the cache entry for a file if available"""
+        entry = self.cache.pop(path, None)
+        if entry is None:
+            self.operation_counts['cache_misses'] += 1
+            return None
+        
+        # Reinsert at the end (most recently used)
+        self.cache[path] = entry
+        self.operation_counts['cache_hits'] += 1
+        return entry
     
-    def _add_to_cache(self, path: str, content: str):
+    def _add_to_cache(self, path: str, content: str) -> List:
         """Add content to cache with LRU eviction"""
-        if len(self.cache) >= self.cache_size:
-            # Evict least recently used
-            self.cache.popitem(last=False)
+        if path in self.cache:
+            del self.cache[path]
+        elif len(self.cache) >= self.cache_size:
+            # Evict least recently used (the oldest key)
+            del self.cache[next(iter(self.cache))]
         
-        self.cache[path] = content
+        entry = self.cache[path] = [content, None]
+        return entry
     
-    def _validate_path(self, path: str) -> Path:
+    def _validate_path(self, path: str) -> str:
         """Validate path with security checks"""
         if path.startswith("/memories"):
             path = path[9:]
         if path.startswith("/"):
             path = path[1:]
         
-        full_path = (self.base_path / path).resolve()
+        # Lexical check first: no Path objects and no filesystem access
+        full_path = os.path.normpath(os.path.join(self._base_str, path))
+        if full_path != self._base_str and not full_path.startswith(self._base_prefix):
+            raise ValueError(f"Path traversal detected: {path}")
         
-        try:
-            full_path.relative_to(self.base_path)
-        except ValueError:
+        # Symlinks inside the tree must not lead back out of it
+        if resolves_outside(self._base_str, full_path):
             raise ValueError(f"Path traversal detected: {path}")
         
         return full_path
@@ -133,16 +217,7 @@ class ReverseEngineeredMemory(MemoryInterface):
         if not command:
             return "Error: No command specified"
         
-        handlers = {
-            "view": self._handle_view,
-            "create": self._handle_create,
-            "str_replace": self._handle_str_replace,
-            "insert": self._handle_insert,
-            "delete": self._handle_delete,
-            "rename": self._handle_rename
-        }
-        
-        handler = handlers.get(command)
+        handler = self._handlers.get(command)
         if not handler:
             return f"Error: Unknown command '{command}'"
         
@@ -195,22 +270,24 @@ class ReverseEngineeredMemory(MemoryInterface):
         """View with cache support"""
         resolved_path = self._validate_path(path)
         
+        # One stat answers the file/directory/exists questions below
+        try:
+            mode = os.stat(resolved_path).st_mode
+        except (FileNotFoundError, NotADirectoryError):
+            mode = None
+        
         # Try cache first for files
-        if resolved_path.is_file():
-            rel_path = str(resolved_path.relative_to(self.base_path))
-            cached = self._get_from_cache(rel_path)
-            if cached is not None:
+        if mode is not None and stat.S_ISREG(mode):
+            rel_path = resolved_path[self._base_prefix_len:]
+            entry = self._get_from_cache(rel_path)
+            if entry is not None:
                 if view_range:
-                    lines = cached.splitlines()
-                    start, end = view_range
-                    start = max(0, start - 1)
-                    end = min(len(lines), end)
-                    return "\n".join(lines[start:end])
-                return cached
+                    return _view_lines(entry, view_range)
+                return entry[0]
         
         # Handle directories using index (faster)
-        if resolved_path == self.base_path or resolved_path.is_dir():
-            rel_dir = "" if resolved_path == self.base_path else str(resolved_path.relative_to(self.base_path))
+        if resolved_path == self._base_str or (mode is not None and stat.S_ISDIR(mode)):
+            rel_dir = "" if resolved_path == self._base_str else resolved_path[self._base_prefix_len:]
             
             # Use index for listing
             items = []
@@ -233,19 +310,15 @@ class ReverseEngineeredMemory(MemoryInterface):
             return f"Directory: {path}\n" + "\n".join(sorted(items))
         
         # File content (not in cache)
-        if resolved_path.exists():
-            content = resolved_path.read_text(encoding="utf-8")
+        if mode is not None:
+            content = _read_text(resolved_path)
             
             # Add to cache
-            rel_path = str(resolved_path.relative_to(self.base_path))
-            self._add_to_cache(rel_path, content)
+            rel_path = resolved_path[self._base_prefix_len:]
+            entry = self._add_to_cache(rel_path, content)
             
             if view_range:
-                lines = content.splitlines()
-                start, end = view_range
-                start = max(0, start - 1)
-                end = min(len(lines), end)
-                return "\n".join(lines[start:end])
+                return _view_lines(entry, view_range)
             
             return content
         
@@ -254,11 +327,11 @@ class ReverseEngineeredMemory(MemoryInterface):
     def create(self, path: str, file_text: str) -> str:
         """Create file with cache update"""
         resolved_path = self._validate_path(path)
-        resolved_path.parent.mkdir(parents=True, exist_ok=True)
-        resolved_path.write_text(file_text, encoding="utf-8")
+        os.makedirs(os.path.dirname(resolved_path), exist_ok=True)
+        _write_text(resolved_path, file_text)
         
         # Add to cache
-        rel_path = str(resolved_path.relative_to(self.base_path))
+        rel_path = resolved_path[self._base_prefix_len:]
         self._add_to_cache(rel_path, file_text)
         
         return f"Created file: {path}"
@@ -267,20 +340,21 @@ class ReverseEngineeredMemory(MemoryInterface):
         """String replace with cache invalidation"""
         resolved_path = self._validate_path(path)
         
-        if not resolved_path.exists():
+        if not os.path.exists(resolved_path):
             return f"Error: File does not exist: {path}"
         
-        content = resolved_path.read_text(encoding="utf-8")
+        content = _read_text(resolved_path)
         
-        if old_str not in content:
+        # The count doubles as the membership test, saving a scan
+        count = content.count(old_str)
+        if not count:
             return f"Error: String not found in file"
         
-        count = content.count(old_str)
         new_content = content.replace(old_str, new_str)
-        resolved_path.write_text(new_content, encoding="utf-8")
+        _write_text(resolved_path, new_content)
         
         # Update cache
-        rel_path = str(resolved_path.relative_to(self.base_path))
+        rel_path = resolved_path[self._base_prefix_len:]
         self._add_to_cache(rel_path, new_content)
         
         return f"Replaced {count} occurrence(s) in {path}"
@@ -289,29 +363,30 @@ class ReverseEngineeredMemory(MemoryInterface):
         """Insert with cache update"""
         resolved_path = self._validate_path(path)
         
-        if not resolved_path.exists():
+        if not os.path.exists(resolved_path):
             if insert_line == 0:
-                resolved_path.write_text(insert_text, encoding="utf-8")
-                rel_path = str(resolved_path.relative_to(self.base_path))
+                _write_text(resolved_path, insert_text)
+                rel_path = resolved_path[self._base_prefix_len:]
                 self._add_to_cache(rel_path, insert_text)
                 return f"Created new file with content at {path}"
             return f"Error: Cannot insert at line {insert_line} in non-existent file"
         
-        content = resolved_path.read_text(encoding="utf-8")
+        content = _read_text(resolved_path)
         lines = content.splitlines()
         
         if insert_line < 0:
             return "Error: Line number must be non-negative"
         
-        while len(lines) < insert_line:
-            lines.append("")
+        # Pad past EOF in one extend rather than an append per missing line
+        if insert_line > len(lines):
+            lines.extend([""] * (insert_line - len(lines)))
         
-        lines.insert(insert_line, insert_text)
+        lines[insert_line:insert_line] = [insert_text]
         new_content = "\n".join(lines)
-        resolved_path.write_text(new_content, encoding="utf-8")
+        _write_text(resolved_path, new_content)
         
         # Update cache
-        rel_path = str(resolved_path.relative_to(self.base_path))
+        rel_path = resolved_path[self._base_prefix_len:]
         self._add_to_cache(rel_path, new_content)
         
         return f"Inserted text at line {insert_line} in {path}"
@@ -320,18 +395,18 @@ class ReverseEngineeredMemory(MemoryInterface):
         """Delete with cache cleanup"""
         resolved_path = self._validate_path(path)
         
-        if not resolved_path.exists():
+        if not os.path.exists(resolved_path):
             return f"Error: Path does not exist: {path}"
         
         # Remove from cache
-        rel_path = str(resolved_path.relative_to(self.base_path))
+        rel_path = resolved_path[self._base_prefix_len:]
         self.cache.pop(rel_path, None)
         
-        if resolved_path.is_dir():
+        if os.path.isdir(resolved_path):
             shutil.rmtree(resolved_path)
             return f"Deleted directory: {path}"
         else:
-            resolved_path.unlink()
+            os.unlink(resolved_path)
             return f"Deleted file: {path}"
     
     def rename(self, old_path: str, new_path: str) -> str:
@@ -339,18 +414,18 @@ class ReverseEngineeredMemory(MemoryInterface):
         old_resolved = self._validate_path(old_path)
         new_resolved = self._validate_path(new_path)
         
-        if not old_resolved.exists():
+        if not os.path.exists(old_resolved):
             return f"Error: Source path does not exist: {old_path}"
         
-        if new_resolved.exists():
+        if os.path.exists(new_resolved):
             return f"Error: Destination already exists: {new_path}"
         
-        new_resolved.parent.mkdir(parents=True, exist_ok=True)
-        old_resolved.rename(new_resolved)
+        os.makedirs(os.path.dirname(new_resolved), exist_ok=True)
+        os.rename(old_resolved, new_resolved)
         
         # Update cache
-        old_rel = str(old_resolved.relative_to(self.base_path))
-        new_rel = str(new_resolved.relative_to(self.base_path))
+        old_rel = old_resolved[self._base_prefix_len:]
+        new_rel = new_resolved[self._base_prefix_len:]
         if old_rel in self.cache:
             self.cache[new_rel] = self.cache.pop(old_rel)
         
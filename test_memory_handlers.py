@@ -0,0 +1,150 @@
+"""
+Behavior tests for the memory handlers' performance machinery.
+
+The harness in test_implementations.py compares timings; these check
+that the write-behind, caching and batching paths return the same
+results as the plain ones.
+"""
+
+import io
+import os
+import random
+import shutil
+import tempfile
+
+import claude_official.memory_handler as claude_handler
+from claude_official.memory_handler import ClaudeOfficialMemory
+from advanced_memory.memory_handler import AdvancedMemory
+
+
+def _temp_dir():
+    return tempfile.mkdtemp(prefix="memory_test_")
+
+
+def _age(path, seconds=60):
+    """Backdate path's mtime so the handler treats it as settled and caches it"""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+def test_advanced_flush_on_close():
+    """Writes still pending in the write-behind buffer reach disk on close()"""
+    base = _temp_dir()
+    try:
+        # A long interval keeps the background flush out of the way
+        memory = AdvancedMemory(base, flush_interval=60)
+        memory.create("/memories/note.txt", "pending")
+        memory.str_replace("/memories/note.txt", "pending", "flushed")
+        assert memory.dirty
+        
+        memory.close()
+        
+        assert not memory.dirty
+        with open(os.path.join(base, "working", "note.txt"), encoding="utf-8") as f:
+            assert f.read() == "flushed"
+        assert not memory._flush_thread.is_alive()
+        assert not memory._reorg_thread.is_alive()
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_advanced_visible_to_second_instance():
+    """A closed instance's files are loaded by the next one on the same directory"""
+    base = _temp_dir()
+    try:
+        with AdvancedMemory(base, flush_interval=60) as memory:
+            memory.create("/memories/shared.txt", "from the first instance")
+        
+        with AdvancedMemory(base, flush_interval=60) as memory:
+            assert memory.view("/memories/shared.txt") == "from the first instance"
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_claude_batched_matches_sequential():
+    """A handle_tool_calls run gives the same results and file as one call at a time"""
+    calls = [
+        {"command": "create", "path": "/memories/run.txt", "file_text": "alpha\r\nbeta\ngamma"},
+        {"command": "view", "path": "/memories/run.txt"},
+        {"command": "str_replace", "path": "/memories/run.txt", "old_str": "beta", "new_str": "BETA"},
+        {"command": "insert", "path": "/memories/run.txt", "insert_line": 1, "insert_text": "inserted"},
+        {"command": "str_replace", "path": "/memories/run.txt", "old_str": "missing", "new_str": "x"},
+        {"command": "view", "path": "/memories/run.txt", "view_range": [2, 3]},
+        {"command": "str_replace", "path": "/memories/run.txt", "old_str": "alpha\n", "new_str": ""},
+        {"command": "view", "path": "/memories/run.txt"},
+        {"command": "view", "path": "/memories"},
+    ]
+    sequential_base, batched_base = _temp_dir(), _temp_dir()
+    try:
+        sequential = ClaudeOfficialMemory(sequential_base)
+        batched = ClaudeOfficialMemory(batched_base)
+        
+        expected = [sequential.handle_tool_call(call) for call in calls]
+        assert batched.handle_tool_calls(calls) == expected
+        
+        with open(os.path.join(sequential_base, "run.txt"), "rb") as f:
+            expected_bytes = f.read()
+        with open(os.path.join(batched_base, "run.txt"), "rb") as f:
+            assert f.read() == expected_bytes
+    finally:
+        shutil.rmtree(sequential_base, ignore_errors=True)
+        shutil.rmtree(batched_base, ignore_errors=True)
+
+
+def test_claude_stream_replace_matches_bytes_replace():
+    """Chunked replacement agrees with bytes.replace, including matches split across chunks"""
+    rng = random.Random(0)
+    saved = claude_handler._READ_CHUNK
+    # Tiny chunks put most matches and CRLFs across a chunk boundary
+    claude_handler._READ_CHUNK = 3
+    try:
+        for _ in range(500):
+            data = bytes(rng.choice(b"ab\r\n") for _ in range(rng.randrange(40)))
+            old = bytes(rng.choice(b"ab\n") for _ in range(rng.randrange(1, 5)))
+            new = bytes(rng.choice(b"xy\n") for _ in range(rng.randrange(4)))
+            
+            out = io.BytesIO()
+            count = claude_handler._stream_replace(
+                claude_handler._normalized_chunks(io.BytesIO(data)), out, old, new)
+            
+            normalized = claude_handler._normalize_newlines(data)
+            assert out.getvalue() == normalized.replace(old, new), (data, old, new)
+            assert count == normalized.count(old), (data, old, new)
+    finally:
+        claude_handler._READ_CHUNK = saved
+
+
+def test_claude_cache_sees_external_writes():
+    """Cached views are dropped when another process changes the file or the root"""
+    base = _temp_dir()
+    try:
+        memory = ClaudeOfficialMemory(base)
+        memory.create("/memories/shared.txt", "version one")
+        path = os.path.join(base, "shared.txt")
+        _age(path, seconds=120)
+        _age(base, seconds=120)
+        
+        assert memory.view("/memories/shared.txt") == "version one"
+        assert path in memory._file_cache
+        assert "shared.txt" in memory.view("/memories")
+        assert memory._root_listing is not None
+        
+        # Same size, so only the mtime tells the two versions apart
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("version two")
+        _age(path, seconds=60)
+        assert memory.view("/memories/shared.txt") == "version two"
+        
+        # A file created behind the handler's back moves the root's mtime
+        with open(os.path.join(base, "external.txt"), "w", encoding="utf-8") as f:
+            f.write("external")
+        assert "external.txt" in memory.view("/memories")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
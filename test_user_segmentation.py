@@ -7,6 +7,7 @@ This tests the key questions:
 3. What are the advanced features we can build?
 """
 
+import os
 from pathlib import Path
 import shutil
 from claude_official.memory_handler import ClaudeOfficialMemory
@@ -33,8 +34,18 @@ class UserSegmentedMemory(ClaudeOfficialMemory):
     
     def get_user_info(self):
         """Get information about this user's memory usage."""
-        total_files = len(list(self.base_path.rglob("*"))) if self.base_path.exists() else 0
-        total_size = sum(f.stat().st_size for f in self.base_path.rglob("*") if f.is_file()) if self.base_path.exists() else 0
+        total_files = total_size = 0
+        
+        # Single scandir walk for both totals instead of two rglob passes
+        pending = [str(self.base_path)] if self.base_path.exists() else []
+        while pending:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    total_files += 1
+                    if entry.is_file():
+                        total_size += entry.stat().st_size
+                    elif entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
         
         return {
             "user_id": self.user_id,
@@ -49,8 +60,19 @@ class UserSegmentedMemory(ClaudeOfficialMemory):
         if not self.base_path.exists():
             return []
         
-        dirs = [d.relative_to(self.base_path) for d in self.base_path.rglob("*") if d.is_dir()]
-        return sorted(str(d) for d in dirs)
+        # scandir walk carrying relative names, so no Path per entry
+        dirs = []
+        pending = [(str(self.base_path), "")]
+        while pending:
+            path, rel = pending.pop()
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        name = rel + entry.name
+                        dirs.append(name)
+                        if not entry.is_symlink():
+                            pending.append((entry.path, name + os.sep))
+        return sorted(dirs)
     
     def get_memory_tree(self):
         """Generate a tree view of all memories."""
@@ -59,7 +81,8 @@ class UserSegmentedMemory(ClaudeOfficialMemory):
         
         def build_tree(path, prefix=""):
             items = []
-            children = sorted(path.iterdir()) if path.is_dir() else []
+            with os.scandir(path) as it:
+                children = sorted(it, key=lambda entry: entry.name)
             
             for i, child in enumerate(children):
                 is_last = i == len(children) - 1
@@ -68,12 +91,12 @@ class UserSegmentedMemory(ClaudeOfficialMemory):
                 
                 if child.is_dir():
                     next_prefix = prefix + ("    " if is_last else "│   ")
-                    items.extend(build_tree(child, next_prefix))
+                    items.extend(build_tree(child.path, next_prefix))
             
             return items
         
         tree_lines = [f"user_{self.user_id}/"]
-        tree_lines.extend(build_tree(self.base_path))
+        tree_lines.extend(build_tree(str(self.base_path)))
         return "\n".join(tree_lines)
 
 